@@ -12,41 +12,186 @@ Usage:
     ai-cli review code.py
 """
 
+from __future__ import annotations
+
 import argparse
 import json
-import requests
 import sys
 import os
-import subprocess
-from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, TYPE_CHECKING
 import time
+import codecs
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+if TYPE_CHECKING:
+    from response_cache import ResponseCache
+
+try:
+    import orjson
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:
+    orjson = None
+    json_loads = json.loads
+
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+# Request bodies are serialized up front and sent as raw bytes
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Files above this size are truncated (explain) or summarized in parts (summarize)
+MAX_INPUT_BYTES = 200_000
+# Files above this size are refused by review
+MAX_REVIEW_BYTES = 1_000_000
+# Roughly 8K tokens per part when summarizing large files
+SUMMARY_WINDOW_CHARS = 32_000
+# Files needing more parts than this are refused by summarize
+MAX_SUMMARY_PARTS = 64
+
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# How long Ollama keeps the model loaded during an interactive session
+KEEP_ALIVE = "30m"
+
+# System prompts are module constants so every request for a command sends
+# byte-identical text. Ollama reuses the KV cache of a matching prompt prefix,
+# so anything request-specific (like the target language) belongs in the user
+# prompt, never in these strings.
+SYSTEM_CODE = (
+    "You are an expert programmer. Provide clean, well-commented code solutions.\n"
+    "Always include explanations of how the code works. Format code blocks properly with language markers."
+)
+SYSTEM_EXPLAIN = (
+    "You are a helpful teacher. Explain concepts clearly and thoroughly.\n"
+    "Use examples when helpful. Break down complex topics into understandable parts."
+)
+SYSTEM_TRANSLATE = (
+    "You are a professional translator. Translate the given text to the requested language accurately,\n"
+    "maintaining the original meaning and context. Provide only the translation unless asked otherwise."
+)
+SYSTEM_SUMMARIZE = (
+    "You are an expert at creating concise, informative summaries.\n"
+    "Capture the key points and main ideas while being clear and comprehensive."
+)
+SYSTEM_REVIEW = (
+    "You are an experienced code reviewer. Analyze code for:\n"
+    "- Bugs and potential issues\n"
+    "- Performance improvements\n"
+    "- Best practices\n"
+    "- Security concerns\n"
+    "- Code style and readability\n"
+    "Provide constructive feedback with specific suggestions."
+)
 
 class AIClient:
-    def __init__(self, base_url: str = "http://localhost:11434"):
+    def __init__(self, base_url: str = "http://localhost:11434", cache: Optional[ResponseCache] = None):
         self.base_url = base_url
         self.default_model = "llama3-small-q3-k-s"
+        self.cache = cache
+        # Embedding model for fuzzy cache matches; None keeps the cache exact-match only
+        self.embed_model = None
+        # requests pulls in urllib3, ssl and charset detection; only pay for
+        # that once a client is actually needed
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util import Retry
+        
+        # Retry connection errors and gateway errors, sleeping 0s, 0.4s and
+        # 0.8s between attempts (urllib3 doesn't back off before the first
+        # retry). A read timeout means a slow generation, not a network blip,
+        # so it is never retried: that would only start the generation again.
+        # Other HTTP errors are returned immediately.
+        self._retries = Retry(
+            total=3,
+            read=0,
+            backoff_factor=0.2,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=['POST', 'GET'],
+            raise_on_status=False
+        )
+        # Reuse one pooled keep-alive connection for every request
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=self._retries))
+        # The health check and model list fail fast: if Ollama isn't running,
+        # retrying only delays the error
+        self.session.mount(f"{self.base_url}/api/tags", HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=0))
+        # (timestamp, healthy) of the last connection check
+        self._health_cache = (0.0, False)
+        self.health_ttl = 30
         
     def check_connection(self) -> bool:
         """Check if Ollama is running and accessible"""
+        checked_at, healthy = self._health_cache
+        if healthy and time.monotonic() - checked_at < self.health_ttl:
+            return True
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            return response.status_code == 200
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=5)
+            healthy = response.status_code == 200
         except:
-            return False
+            healthy = False
+        self._health_cache = (time.monotonic(), healthy)
+        return healthy
     
     def list_models(self) -> List[Dict]:
         """Get list of available models"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags")
+            response = self.session.get(f"{self.base_url}/api/tags")
             if response.status_code == 200:
                 return response.json().get("models", [])
             return []
         except:
             return []
     
-    def chat(self, message: str, model: Optional[str] = None, system_prompt: Optional[str] = None) -> str:
+    def embed(self, text: str, model: Optional[str] = None) -> Optional[List[float]]:
+        """Get an embedding for text, or None if the model can't provide one"""
+        try:
+            response = self.session.post(
+                f"{self.base_url}/api/embeddings",
+                data=json_dumps({"model": model or self.embed_model or self.default_model, "prompt": text}),
+                headers=JSON_HEADERS,
+                timeout=30
+            )
+            if response.status_code == 200:
+                return response.json().get("embedding")
+            return None
+        except:
+            return None
+    
+    def preload(self, model: Optional[str] = None, keep_alive: str = KEEP_ALIVE) -> bool:
+        """Load a model into memory and keep it resident for keep_alive"""
+        try:
+            response = self.session.post(
+                f"{self.base_url}/api/generate",
+                data=json_dumps({"model": model or self.default_model, "prompt": "", "stream": False, "keep_alive": keep_alive}),
+                headers=JSON_HEADERS,
+                timeout=120
+            )
+            return response.status_code == 200
+        except:
+            return False
+    
+    def _cache_get(self, message: str, model: str, system_prompt: Optional[str], params: Dict) -> Optional[str]:
+        if not self.cache:
+            return None
+        embed = (lambda text: self.embed(text, self.embed_model)) if self.embed_model else None
+        return self.cache.get(model, system_prompt, message, embed=embed, params=params)
+    
+    def chat(self, message: str, model: Optional[str] = None, system_prompt: Optional[str] = None,
+             options: Optional[Dict] = None, cache_scope: Optional[str] = None,
+             keep_alive: Optional[str] = None) -> str:
         """Send a chat message to the model"""
+        try:
+            return self.generate(message, model, system_prompt, options, cache_scope, keep_alive)
+        except RuntimeError as e:
+            return str(e)
+    
+    def generate(self, message: str, model: Optional[str] = None, system_prompt: Optional[str] = None,
+                 options: Optional[Dict] = None, cache_scope: Optional[str] = None,
+                 keep_alive: Optional[str] = None) -> str:
+        """Send a chat message to the model, raising RuntimeError if no response comes back"""
         if not model:
             model = self.default_model
             
@@ -58,22 +203,48 @@ class AIClient:
         
         if system_prompt:
             payload["system"] = system_prompt
+        
+        if options:
+            payload["options"] = options
+        
+        # Every request resets Ollama's unload timer, so repeat the preload's keep_alive
+        if keep_alive:
+            payload["keep_alive"] = keep_alive
+        
+        # Generation options change the output, so they're part of the cache key.
+        # cache_scope carries request details that only appear in the user
+        # prompt (like a target language) so similar prompts can't cross over
+        cache_params = {"options": options or {}}
+        if cache_scope:
+            cache_params["scope"] = cache_scope
+        cached = self._cache_get(message, model, system_prompt, cache_params)
+        if cached is not None:
+            return cached
             
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/generate",
-                json=payload,
+                data=json_dumps(payload),
+                headers=JSON_HEADERS,
                 timeout=120
             )
-            
-            if response.status_code == 200:
-                return response.json().get("response", "No response received")
-            else:
-                return f"Error: {response.status_code} - {response.text}"
+            text = response.json().get("response") if response.status_code == 200 else None
         except Exception as e:
-            return f"Connection error: {e}"
+            self._health_cache = (0.0, False)
+            raise RuntimeError(f"Connection error: {e}") from e
+        
+        if response.status_code != 200:
+            self._health_cache = (0.0, False)
+            raise RuntimeError(f"Error: {response.status_code} - {response.text}")
+        if text is None:
+            raise RuntimeError("No response received")
+        if self.cache:
+            self.cache.put(model, system_prompt, message, text, params=cache_params)
+        return text
     
-    def chat_stream(self, message: str, model: Optional[str] = None, system_prompt: Optional[str] = None):
+    def chat_stream(self, message: str, model: Optional[str] = None, system_prompt: Optional[str] = None,
+                    options: Optional[Dict] = None, cache_scope: Optional[str] = None,
+                    keep_alive: Optional[str] = None):
         """Send a chat message with streaming response"""
         if not model:
             model = self.default_model
@@ -86,26 +257,87 @@ class AIClient:
         
         if system_prompt:
             payload["system"] = system_prompt
+        
+        if options:
+            payload["options"] = options
+        
+        # Every request resets Ollama's unload timer, so repeat the preload's keep_alive
+        if keep_alive:
+            payload["keep_alive"] = keep_alive
+        
+        # Generation options change the output, so they're part of the cache key.
+        # cache_scope carries request details that only appear in the user
+        # prompt (like a target language) so similar prompts can't cross over
+        cache_params = {"options": options or {}}
+        if cache_scope:
+            cache_params["scope"] = cache_scope
+        cached = self._cache_get(message, model, system_prompt, cache_params)
+        if cached is not None:
+            yield cached
+            return
             
         try:
-            response = requests.post(
+            with self.session.post(
                 f"{self.base_url}/api/generate",
-                json=payload,
+                data=json_dumps(payload),
+                headers=JSON_HEADERS,
                 stream=True,
                 timeout=120
-            )
-            
-            for line in response.iter_lines():
-                if line:
-                    try:
-                        data = json.loads(line)
-                        if "response" in data:
-                            yield data["response"]
-                    except json.JSONDecodeError:
-                        continue
+            ) as response:
+                if response.status_code != 200:
+                    self._health_cache = (0.0, False)
+                    yield f"Error: {response.status_code} - {response.text}"
+                    return
+                
+                chunks = []
+                done = False
+                for data in self._iter_ndjson(response):
+                    text = data.get("response")
+                    if text:
+                        chunks.append(text)
+                        yield text
+                    if data.get("done"):
+                        done = True
+                        break
+                
+                # Only cache complete generations
+                if done and self.cache:
+                    self.cache.put(model, system_prompt, message, "".join(chunks), params=cache_params)
                         
         except Exception as e:
+            self._health_cache = (0.0, False)
             yield f"Connection error: {e}"
+    
+    def chat_many(self, messages: List[str], model: Optional[str] = None, system_prompt: Optional[str] = None,
+                  max_concurrency: int = 4, options: Optional[Dict] = None) -> List[str]:
+        """Send several messages concurrently, returning responses in order"""
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            return list(pool.map(lambda message: self.chat(message, model, system_prompt, options), messages))
+    
+    @staticmethod
+    def _iter_ndjson(response):
+        """Parse a streamed NDJSON body straight from the raw bytes"""
+        buffer = bytearray()
+        for block in response.iter_content(chunk_size=8192, decode_unicode=False):
+            buffer += block
+            # Several lines usually arrive per network read
+            start = 0
+            end = buffer.find(b"\n")
+            while end != -1:
+                line = bytes(buffer[start:end])
+                if line.strip():
+                    try:
+                        yield json_loads(line)
+                    except ValueError:
+                        pass
+                start = end + 1
+                end = buffer.find(b"\n", start)
+            del buffer[:start]
+        if buffer.strip():
+            try:
+                yield json_loads(bytes(buffer))
+            except ValueError:
+                pass
 
 class AICLI:
     def __init__(self):
@@ -121,18 +353,145 @@ class AICLI:
             'end': '\033[0m',
             'bold': '\033[1m'
         }
+        # The terminal doesn't change during a run, so build the formats once
+        self._tty = sys.stdout.isatty()
+        if self._tty and os.name == 'nt':
+            self._enable_windows_vt()
+        self._fmt = {
+            name: f"{code}{{}}{self.colors['end']}" if self._tty else "{}"
+            for name, code in self.colors.items()
+        }
+        self._bar = self.colored('═' * 60, 'blue')
+        self.p_you = self.colored('👤 You:', 'green')
+        self.p_ai = self.colored('🤖 AI:', 'blue')
+    
+    @staticmethod
+    def _enable_windows_vt():
+        """Let the Windows console interpret ANSI escape sequences"""
+        try:
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+            mode = ctypes.c_uint32()
+            if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+                kernel32.SetConsoleMode(handle, mode.value | 0x0004)  # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        except Exception:
+            pass
     
     def colored(self, text: str, color: str) -> str:
         """Add color to text"""
-        if not sys.stdout.isatty():
-            return text
-        return f"{self.colors.get(color, '')}{text}{self.colors['end']}"
+        return self._fmt.get(color, "{}").format(text)
     
     def print_header(self, text: str):
         """Print a colored header"""
-        print(f"\n{self.colored('═' * 60, 'blue')}")
-        print(f"{self.colored(f'🤖 AI CLI - {text}', 'bold')}")
-        print(f"{self.colored('═' * 60, 'blue')}\n")
+        print(f"\n{self._bar}\n{self.colored(f'🤖 AI CLI - {text}', 'bold')}\n{self._bar}\n")
+    
+    def _write(self, data):
+        """Write straight to the stdout file descriptor, bypassing the text layer"""
+        view = memoryview(data.encode('utf-8') if isinstance(data, str) else data)
+        while view:
+            view = view[os.write(1, view):]
+    
+    def _stream_to_stdout(self, chunks) -> str:
+        """Write streamed chunks as raw UTF-8, coalescing flushes"""
+        sys.stdout.flush()
+        # On a terminal flush at most every 16ms, when piped only per line
+        interval = 0.016 if self._tty else float('inf')
+        last_flush = time.monotonic()
+        pending = bytearray()
+        parts = []
+        for chunk in chunks:
+            parts.append(chunk)
+            pending += chunk.encode('utf-8')
+            now = time.monotonic()
+            if '\n' in chunk or now - last_flush > interval:
+                self._write(pending)
+                pending.clear()
+                last_flush = now
+        self._write(pending)
+        return "".join(parts)
+    
+    def _fast_read_text(self, path: str) -> str:
+        """Read a whole UTF-8 file as bytes and decode it once"""
+        with open(path, 'rb') as f:
+            return f.read().decode('utf-8', errors='replace')
+    
+    def _read_file_bounded(self, path: str, max_bytes: int = MAX_INPUT_BYTES):
+        """Read at most max_bytes of a UTF-8 file, returning (text, truncated)"""
+        with open(path, 'rb') as f:
+            buf = f.read(max_bytes)
+            truncated = bool(f.read(1))
+        # Hold back a multi-byte character cut in half by the limit
+        return codecs.getincrementaldecoder('utf-8')('replace').decode(buf, final=not truncated), truncated
+    
+    def _iter_file_windows(self, path: str, window_chars: int = SUMMARY_WINDOW_CHARS):
+        """Yield a text file in windows of about window_chars, split on paragraph boundaries"""
+        decoder = codecs.getincrementaldecoder('utf-8')('replace')
+        buf = ""
+        with open(path, 'rb') as f:
+            while True:
+                block = f.read(window_chars)
+                if not block:
+                    buf += decoder.decode(b"", final=True)
+                    break
+                buf += decoder.decode(block)
+                while len(buf) >= window_chars:
+                    cut = buf.rfind('\n\n', 0, window_chars)
+                    if cut <= 0:
+                        cut = window_chars
+                    yield buf[:cut]
+                    buf = buf[cut:].lstrip('\n')
+        if buf.strip():
+            yield buf
+    
+    def _run_batch(self, title: str, paths: List[str], build_prompt, system_prompt: str,
+                   options: Optional[Dict], args):
+        """Process several files concurrently and print the results grouped by file
+        
+        build_prompt(path) returns (prompt, warning) and applies the same size
+        rules as the command does for a single file.
+        """
+        self.print_header(f"{title}: {len(paths)} files")
+        
+        # Prompts are built one file at a time: reading is cheap, and a large
+        # file's map phase already sends up to --concurrency requests itself
+        built = []
+        for path in paths:
+            try:
+                prompt, warning = build_prompt(path)
+                built.append((prompt, warning, None))
+            except Exception as e:
+                built.append((None, None, e))
+        
+        ok = [(path, prompt) for path, (prompt, _, error) in zip(paths, built) if error is None]
+        responses = self.client.chat_many(
+            [prompt for _, prompt in ok],
+            args.model, system_prompt, args.concurrency, options
+        )
+        results = dict(zip((path for path, _ in ok), responses))
+        
+        for path, (_, warning, error) in zip(paths, built):
+            print(f"{self.colored(f'📄 {path}', 'green')}")
+            if error is not None:
+                self._print_file_error(error)
+                print()
+                continue
+            if warning:
+                print(f"{self.colored('⚠️  Warning:', 'yellow')} {warning}")
+            print(f"{results[path]}\n")
+    
+    def _print_file_error(self, error: Exception):
+        """Print why a file could not be processed"""
+        if isinstance(error, OSError):
+            print(f"{self.colored('❌ Error reading file:', 'red')} {error}")
+        else:
+            print(f"{self.colored('❌ Error:', 'red')} {error}")
+    
+    def _options(self, args, num_predict: Optional[int] = None) -> Optional[Dict]:
+        """Generation options for a command, honoring --max-tokens"""
+        if args.max_tokens is not None:
+            num_predict = args.max_tokens
+        return {"num_predict": num_predict} if num_predict is not None else None
     
     def check_ollama_status(self) -> bool:
         """Check if Ollama is running"""
@@ -146,58 +505,69 @@ class AICLI:
         """Interactive chat or single message"""
         if not self.check_ollama_status():
             return
+        
+        options = self._options(args)
             
         if args.message:
             # Single message mode
             self.print_header(f"Chat with {args.model}")
-            print(f"{self.colored('👤 You:', 'green')} {args.message}")
-            print(f"{self.colored('🤖 AI:', 'blue')}", end=" ", flush=True)
+            print(f"{self.p_you} {args.message}")
+            print(self.p_ai, end=" ", flush=True)
             
             if args.stream:
-                response = ""
-                for chunk in self.client.chat_stream(args.message, args.model):
-                    print(chunk, end="", flush=True)
-                    response += chunk
+                response = self._stream_to_stdout(self.client.chat_stream(args.message, args.model, options=options))
                 print()
             else:
-                response = self.client.chat(args.message, args.model)
+                response = self.client.chat(args.message, args.model, options=options)
                 print(response)
         else:
             # Interactive mode
+            # Load the model while the user types the first message
+            threading.Thread(target=self.client.preload, args=(args.model,), daemon=True).start()
+            
             self.print_header(f"Interactive Chat with {args.model}")
             print(f"{self.colored('Type /quit to exit, /help for commands', 'yellow')}\n")
             
+            try:
+                from prompt_toolkit import PromptSession
+                from prompt_toolkit.formatted_text import ANSI
+                from prompt_toolkit.history import FileHistory
+            except ImportError:
+                PromptSession = None
+            
+            if PromptSession is not None and self._tty and sys.stdin.isatty():
+                # Line editing plus up-arrow recall of earlier sessions
+                session = PromptSession(history=FileHistory(os.path.expanduser('~/.ai-cli-history')))
+                read_message = lambda: session.prompt(ANSI(f"{self.p_you} "))
+            else:
+                read_message = lambda: input(f"{self.p_you} ")
+            
             while True:
                 try:
-                    message = input(f"{self.colored('👤 You: ', 'green')}")
+                    message = read_message()
                     
-                    if message.lower() in ['/quit', '/exit', '/q']:
-                        print(f"{self.colored('👋 Goodbye!', 'yellow')}")
-                        break
-                    elif message.lower() == '/help':
-                        self.show_interactive_help()
-                        continue
-                    elif message.lower() == '/clear':
-                        os.system('clear' if os.name == 'posix' else 'cls')
-                        continue
-                    elif message.lower() == '/models':
-                        self.list_models()
-                        continue
+                    # Only lowercase the command word, never a whole pasted message
+                    if message.startswith('/'):
+                        handler = self.INTERACTIVE_COMMANDS.get(message.split(None, 1)[0].lower())
+                        if handler:
+                            if handler(self):
+                                break
+                            continue
                         
                     if not message.strip():
                         continue
                         
-                    print(f"{self.colored('🤖 AI:', 'blue')}", end=" ", flush=True)
+                    print(self.p_ai, end=" ", flush=True)
                     
                     if args.stream:
-                        for chunk in self.client.chat_stream(message, args.model):
-                            print(chunk, end="", flush=True)
+                        self._stream_to_stdout(self.client.chat_stream(message, args.model, options=options,
+                                                                       keep_alive=KEEP_ALIVE))
                         print("\n")
                     else:
-                        response = self.client.chat(message, args.model)
+                        response = self.client.chat(message, args.model, options=options, keep_alive=KEEP_ALIVE)
                         print(f"{response}\n")
                         
-                except KeyboardInterrupt:
+                except (KeyboardInterrupt, EOFError):
                     print(f"\n{self.colored('👋 Goodbye!', 'yellow')}")
                     break
     
@@ -206,19 +576,18 @@ class AICLI:
         if not self.check_ollama_status():
             return
             
-        system_prompt = """You are an expert programmer. Provide clean, well-commented code solutions. 
-        Always include explanations of how the code works. Format code blocks properly with language markers."""
+        options = self._options(args, 2048)
+        system_prompt = SYSTEM_CODE
         
         self.print_header("Code Assistant")
         print(f"{self.colored('📝 Request:', 'green')} {args.prompt}")
         print(f"{self.colored('💻 AI Response:', 'blue')}\n")
         
         if args.stream:
-            for chunk in self.client.chat_stream(args.prompt, args.model, system_prompt):
-                print(chunk, end="", flush=True)
+            self._stream_to_stdout(self.client.chat_stream(args.prompt, args.model, system_prompt, options))
             print()
         else:
-            response = self.client.chat(args.prompt, args.model, system_prompt)
+            response = self.client.chat(args.prompt, args.model, system_prompt, options)
             print(response)
     
     def cmd_explain(self, args):
@@ -226,53 +595,65 @@ class AICLI:
         if not self.check_ollama_status():
             return
             
-        system_prompt = """You are a helpful teacher. Explain concepts clearly and thoroughly. 
-        Use examples when helpful. Break down complex topics into understandable parts."""
+        options = self._options(args, 2048)
+        system_prompt = SYSTEM_EXPLAIN
+        
+        # Several files are a batch; anything else is one (unquoted) topic
+        if len(args.topic) > 1 and all(os.path.isfile(topic) for topic in args.topic):
+            self._run_batch("Explanation", args.topic, self._explain_file_prompt, system_prompt, options, args)
+            return
+        topic = " ".join(args.topic)
         
         # Check if it's a file
-        if os.path.isfile(args.topic):
+        if os.path.isfile(topic):
             try:
-                with open(args.topic, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                prompt = f"Please explain this code:\n\n```\n{content}\n```"
+                prompt, warning = self._explain_file_prompt(topic)
             except Exception as e:
-                print(f"{self.colored('❌ Error reading file:', 'red')} {e}")
+                self._print_file_error(e)
                 return
+            if warning:
+                print(f"{self.colored('⚠️  Warning:', 'yellow')} {warning}")
         else:
-            prompt = f"Please explain: {args.topic}"
+            prompt = f"Please explain: {topic}"
             
         self.print_header("Explanation")
-        print(f"{self.colored('❓ Topic:', 'green')} {args.topic}")
+        print(f"{self.colored('❓ Topic:', 'green')} {topic}")
         print(f"{self.colored('📚 Explanation:', 'blue')}\n")
         
         if args.stream:
-            for chunk in self.client.chat_stream(prompt, args.model, system_prompt):
-                print(chunk, end="", flush=True)
+            self._stream_to_stdout(self.client.chat_stream(prompt, args.model, system_prompt, options))
             print()
         else:
-            response = self.client.chat(prompt, args.model, system_prompt)
+            response = self.client.chat(prompt, args.model, system_prompt, options)
             print(response)
     
+    def _explain_file_prompt(self, path: str):
+        """Build the explain prompt for a file, truncating it to MAX_INPUT_BYTES"""
+        content, truncated = self._read_file_bounded(path)
+        warning = f"Only the first {MAX_INPUT_BYTES // 1000}KB of {path} will be explained" if truncated else None
+        return "".join(("Please explain this code:\n\n```\n", content, "\n```")), warning
+    
     def cmd_translate(self, args):
         """Translate text"""
         if not self.check_ollama_status():
             return
             
-        system_prompt = f"""You are a professional translator. Translate the given text to {args.to} accurately, 
-        maintaining the original meaning and context. Provide only the translation unless asked otherwise."""
+        options = self._options(args, 256)
+        system_prompt = SYSTEM_TRANSLATE
         
         self.print_header(f"Translation to {args.to}")
         print(f"{self.colored('🌐 Original:', 'green')} {args.text}")
         print(f"{self.colored('🔄 Translation:', 'blue')}\n")
         
         prompt = f"Translate this to {args.to}: {args.text}"
+        # The target language isn't in the shared system prompt, so scope the cache by it
+        cache_scope = f"translate:{args.to.strip().lower()}"
         
         if args.stream:
-            for chunk in self.client.chat_stream(prompt, args.model, system_prompt):
-                print(chunk, end="", flush=True)
+            self._stream_to_stdout(self.client.chat_stream(prompt, args.model, system_prompt, options, cache_scope))
             print()
         else:
-            response = self.client.chat(prompt, args.model, system_prompt)
+            response = self.client.chat(prompt, args.model, system_prompt, options, cache_scope)
             print(response)
     
     def cmd_summarize(self, args):
@@ -280,22 +661,30 @@ class AICLI:
         if not self.check_ollama_status():
             return
             
-        system_prompt = """You are an expert at creating concise, informative summaries. 
-        Capture the key points and main ideas while being clear and comprehensive."""
+        options = self._options(args, 512)
+        system_prompt = SYSTEM_SUMMARIZE
+        
+        # Several files are a batch; anything else is one (unquoted) text
+        if len(args.input) > 1 and all(os.path.isfile(item) for item in args.input):
+            build_prompt = lambda path: self._summarize_file_prompt(path, system_prompt, options, args,
+                                                                    progress=True)
+            self._run_batch("Summary", args.input, build_prompt, system_prompt, options, args)
+            return
+        source = " ".join(args.input)
         
         # Check if it's a file
-        if os.path.isfile(args.input):
+        if os.path.isfile(source):
+            if os.path.getsize(source) > MAX_INPUT_BYTES:
+                self._summarize_large(source, system_prompt, options, args)
+                return
             try:
-                with open(args.input, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                prompt = f"Please summarize this content:\n\n{content}"
-                input_desc = f"File: {args.input}"
+                prompt, _ = self._summarize_file_prompt(source, system_prompt, options, args)
+                input_desc = f"File: {source}"
             except Exception as e:
-                print(f"{self.colored('❌ Error reading file:', 'red')} {e}")
+                self._print_file_error(e)
                 return
         else:
-            prompt = f"Please summarize: {args.input}"
-            content = args.input
+            prompt = f"Please summarize: {source}"
             input_desc = "Text input"
             
         self.print_header("Summary")
@@ -303,52 +692,157 @@ class AICLI:
         print(f"{self.colored('📝 Summary:', 'blue')}\n")
         
         if args.stream:
-            for chunk in self.client.chat_stream(prompt, args.model, system_prompt):
-                print(chunk, end="", flush=True)
+            self._stream_to_stdout(self.client.chat_stream(prompt, args.model, system_prompt, options))
             print()
         else:
-            response = self.client.chat(prompt, args.model, system_prompt)
+            response = self.client.chat(prompt, args.model, system_prompt, options)
             print(response)
     
+    def _summarize_file_prompt(self, path: str, system_prompt: str, options: Optional[Dict], args,
+                               progress: bool = False):
+        """Build the summarize prompt for a file, summarizing large files in parts"""
+        if os.path.getsize(path) > MAX_INPUT_BYTES:
+            return self._map_reduce_prompt(path, system_prompt, options, args, progress), None
+        # Build the prompt straight from the file text without keeping a second reference
+        return "".join(("Please summarize this content:\n\n", self._read_file_bounded(path)[0])), None
+    
+    def _summarize_large(self, path: str, system_prompt: str, options: Optional[Dict], args):
+        """Summarize a large file by summarizing its parts and combining the results"""
+        self.print_header("Summary")
+        print(f"{self.colored('📄 Input:', 'green')} File: {path}")
+        
+        try:
+            prompt = self._map_reduce_prompt(path, system_prompt, options, args, progress=True)
+        except Exception as e:
+            print(f"{self.colored('❌ Error:', 'red')} {e}")
+            return
+        
+        print(f"{self.colored('📝 Summary:', 'blue')}\n")
+        if args.stream:
+            self._stream_to_stdout(self.client.chat_stream(prompt, args.model, system_prompt, options))
+            print()
+        else:
+            response = self.client.chat(prompt, args.model, system_prompt, options)
+            print(response)
+    
+    def _map_reduce_prompt(self, path: str, system_prompt: str, options: Optional[Dict], args,
+                           progress: bool = False) -> str:
+        """Summarize each part of a large file, returning the prompt that combines them
+        
+        Windows are read lazily, with at most --concurrency of them in flight.
+        Partial summaries are combined in rounds until they fit in one window.
+        """
+        size = os.path.getsize(path)
+        if size > MAX_SUMMARY_PARTS * SUMMARY_WINDOW_CHARS:
+            raise ValueError(
+                f"{path} is larger than {MAX_SUMMARY_PARTS * SUMMARY_WINDOW_CHARS // 1_000_000}MB; summarize a smaller part of it"
+            )
+        expected = -(-size // SUMMARY_WINDOW_CHARS)
+        
+        # A failed request must not end up in the combine prompt as if it were a summary
+        def summarize_part(number, window):
+            prompt = "".join(("Please summarize this part of a larger document:\n\n", window))
+            try:
+                return self.client.generate(prompt, args.model, system_prompt, options)
+            except RuntimeError as e:
+                raise RuntimeError(f"Part {number} of {path} could not be summarized: {e}") from e
+        
+        def combine_group(group):
+            try:
+                return self.client.generate(combine + "\n\n".join(group), args.model, system_prompt, options)
+            except RuntimeError as e:
+                raise RuntimeError(f"Partial summaries of {path} could not be combined: {e}") from e
+        
+        def collect(future):
+            partials.append(future.result())
+            if progress:
+                end = '\r' if sys.stderr.isatty() else '\n'
+                print(f"📄 {path}: summarized part {len(partials)} of ~{expected}", end=end, file=sys.stderr, flush=True)
+        
+        combine = "Combine these partial summaries of one document into a single summary:\n\n"
+        partials = []
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            in_flight = deque()
+            for count, window in enumerate(self._iter_file_windows(path), 1):
+                if count > MAX_SUMMARY_PARTS:
+                    raise ValueError(f"{path} splits into more than {MAX_SUMMARY_PARTS} parts; summarize a smaller part of it")
+                in_flight.append(pool.submit(summarize_part, count, window))
+                if len(in_flight) >= args.concurrency:
+                    collect(in_flight.popleft())
+            while in_flight:
+                collect(in_flight.popleft())
+            if progress and sys.stderr.isatty():
+                print(file=sys.stderr)
+            
+            if not partials:
+                raise ValueError(f"{path} has no text to summarize")
+            
+            while True:
+                groups = self._group_by_size(partials, SUMMARY_WINDOW_CHARS)
+                if len(groups) == 1:
+                    return combine + "\n\n".join(groups[0])
+                partials = list(pool.map(combine_group, groups))
+    
+    @staticmethod
+    def _group_by_size(texts: List[str], max_chars: int) -> List[List[str]]:
+        """Split texts into consecutive groups of at most max_chars (and at least two texts)"""
+        groups, current, size = [], [], 0
+        for text in texts:
+            # Always pair up texts so every combine round shrinks the list
+            if len(current) >= 2 and size + len(text) > max_chars:
+                groups.append(current)
+                current, size = [], 0
+            current.append(text)
+            size += len(text)
+        if current:
+            groups.append(current)
+        return groups
+    
     def cmd_review(self, args):
         """Code review"""
         if not self.check_ollama_status():
             return
             
-        system_prompt = """You are an experienced code reviewer. Analyze code for:
-        - Bugs and potential issues
-        - Performance improvements
-        - Best practices
-        - Security concerns
-        - Code style and readability
-        Provide constructive feedback with specific suggestions."""
-        
-        if not os.path.isfile(args.file):
-            print(f"{self.colored('❌ Error:', 'red')} File not found: {args.file}")
+        options = self._options(args, 2048)
+        system_prompt = SYSTEM_REVIEW
+        
+        if len(args.file) > 1:
+            self._run_batch("Code Review", args.file, self._review_file_prompt, system_prompt, options, args)
             return
-            
+        file = args.file[0]
+        
+        if not os.path.isfile(file):
+            print(f"{self.colored('❌ Error:', 'red')} File not found: {file}")
+            return
+        
         try:
-            with open(args.file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            prompt, _ = self._review_file_prompt(file)
         except Exception as e:
-            print(f"{self.colored('❌ Error reading file:', 'red')} {e}")
+            self._print_file_error(e)
             return
-            
-        prompt = f"Please review this code and provide feedback:\n\n```\n{content}\n```"
         
-        self.print_header(f"Code Review: {args.file}")
-        print(f"{self.colored('🔍 Reviewing:', 'green')} {args.file}")
+        self.print_header(f"Code Review: {file}")
+        print(f"{self.colored('🔍 Reviewing:', 'green')} {file}")
         print(f"{self.colored('📋 Review:', 'blue')}\n")
         
         if args.stream:
-            for chunk in self.client.chat_stream(prompt, args.model, system_prompt):
-                print(chunk, end="", flush=True)
+            self._stream_to_stdout(self.client.chat_stream(prompt, args.model, system_prompt, options))
             print()
         else:
-            response = self.client.chat(prompt, args.model, system_prompt)
+            response = self.client.chat(prompt, args.model, system_prompt, options)
             print(response)
     
-    def list_models(self):
+    def _review_file_prompt(self, path: str):
+        """Build the review prompt for a file, refusing files over MAX_REVIEW_BYTES"""
+        if os.path.getsize(path) > MAX_REVIEW_BYTES:
+            raise ValueError(f"{path} is larger than {MAX_REVIEW_BYTES // 1_000_000}MB; review a smaller part of it")
+        return "".join((
+            "Please review this code and provide feedback:\n\n```\n",
+            self._fast_read_text(path),
+            "\n```"
+        )), None
+    
+    def print_models(self):
         """List available models"""
         self.print_header("Available Models")
         
@@ -369,11 +863,11 @@ class AICLI:
     
     def format_size(self, bytes_size: int) -> str:
         """Format bytes to human readable format"""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if bytes_size < 1024.0:
-                return f"{bytes_size:.1f}{unit}"
-            bytes_size /= 1024.0
-        return f"{bytes_size:.1f}TB"
+        if bytes_size <= 0:
+            return "0.0B"
+        # Each unit is 10 bits wide, so the bit length picks it directly
+        idx = min((int(bytes_size).bit_length() - 1) // 10, len(SIZE_UNITS) - 1)
+        return f"{bytes_size / (1 << (idx * 10)):.1f}{SIZE_UNITS[idx]}"
     
     def show_interactive_help(self):
         """Show help for interactive mode"""
@@ -383,10 +877,40 @@ class AICLI:
         print(f"{self.colored('/clear', 'green'):20} - Clear screen")
         print(f"{self.colored('/models', 'green'):20} - List available models")
         print()
+    
+    def _interactive_quit(self) -> bool:
+        print(f"{self.colored('👋 Goodbye!', 'yellow')}")
+        return True
+    
+    def _interactive_clear(self):
+        sys.stdout.write('\x1b[2J\x1b[H')
+        sys.stdout.flush()
+    
+    # Slash commands for interactive chat; a handler returning True ends the session
+    INTERACTIVE_COMMANDS = {
+        '/quit': _interactive_quit,
+        '/exit': _interactive_quit,
+        '/q': _interactive_quit,
+        '/help': show_interactive_help,
+        '/clear': _interactive_clear,
+        '/models': print_models,
+    }
+
+def positive_int(value: str) -> int:
+    """argparse type for options that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+def token_limit(value: str) -> int:
+    """argparse type for --max-tokens: at least 1, or -1 for no limit"""
+    number = int(value)
+    if number < 1 and number != -1:
+        raise argparse.ArgumentTypeError(f"must be at least 1 (or -1 for no limit), got {number}")
+    return number
 
 def main():
-    cli = AICLI()
-    
     parser = argparse.ArgumentParser(
         description="AI CLI - Local AI Assistant similar to Claude Code",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -399,6 +923,7 @@ Examples:
   ai-cli translate "Bonjour le monde" --to english
   ai-cli summarize document.txt
   ai-cli review mycode.py
+  ai-cli --concurrency 4 summarize *.txt
   ai-cli models
         """
     )
@@ -407,6 +932,14 @@ Examples:
                        help='Model to use (default: llama3-small-q3-k-s)')
     parser.add_argument('--stream', '-s', action='store_true',
                        help='Stream response in real-time')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Always query the model, bypassing the response cache')
+    parser.add_argument('--embed-model',
+                       help='Embedding model used to also match similar short prompts in the cache (default: exact matches only)')
+    parser.add_argument('--max-tokens', type=token_limit,
+                       help='Maximum tokens to generate, -1 for no limit (default: depends on the command)')
+    parser.add_argument('--concurrency', type=positive_int, default=4,
+                       help='Parallel requests when processing several files (default: 4)')
     
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
@@ -422,7 +955,7 @@ Examples:
     
     # Explain command
     explain_parser = subparsers.add_parser('explain', help='Explain concepts or code')
-    explain_parser.add_argument('topic', help='Topic to explain or file to analyze')
+    explain_parser.add_argument('topic', nargs='+', help='Topic to explain or file(s) to analyze')
     
     # Translate command
     translate_parser = subparsers.add_parser('translate', help='Translate text')
@@ -431,17 +964,23 @@ Examples:
     
     # Summarize command
     summarize_parser = subparsers.add_parser('summarize', help='Summarize text or files')
-    summarize_parser.add_argument('input', help='Text to summarize or file path')
+    summarize_parser.add_argument('input', nargs='+', help='Text to summarize or file path(s)')
     
     # Review command
     review_parser = subparsers.add_parser('review', help='Code review')
-    review_parser.add_argument('file', help='File to review')
+    review_parser.add_argument('file', nargs='+', help='File(s) to review')
     
     # Models command
-    models_parser = subparsers.add_parser('models', help='List available models')
+    subparsers.add_parser('models', help='List available models')
     
     args = parser.parse_args()
     
+    cli = AICLI()
+    if not args.no_cache:
+        from response_cache import ResponseCache
+        cli.client.cache = ResponseCache()
+        cli.client.embed_model = args.embed_model
+    
     if not args.command:
         # Default to interactive chat
         args.command = 'chat'
@@ -462,7 +1001,7 @@ Examples:
     elif args.command == 'review':
         cli.cmd_review(args)
     elif args.command == 'models':
-        cli.list_models()
+        cli.print_models()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
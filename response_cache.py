@@ -0,0 +1,188 @@
+"""
+Response cache for AI CLI
+
+Stores model responses on disk so repeated (or very similar) prompts can be
+answered without another round-trip to Ollama.
+
+Lookup happens in two steps:
+    1. Exact match on sha256(model, system prompt, params, prompt), ignoring
+       only leading and trailing whitespace of the prompt
+    2. Optionally, for short free-text prompts only, cosine similarity against
+       the most recent embeddings for the same model/system prompt/params
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_CACHE_PATH = os.path.expanduser("~/.ai-cli-cache.db")
+
+# numpy module, None if it isn't installed, or False until first needed
+_numpy = False
+
+
+def _load_numpy():
+    """Import numpy on first use; only similarity lookups need it"""
+    global _numpy
+    if _numpy is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy = numpy
+    return _numpy
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Strip surrounding whitespace only; case, punctuation and indentation
+    all change the meaning of code"""
+    return prompt.strip()
+
+
+def _sha256(*parts: str) -> str:
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+
+def _scope_and_key(model: str, system_prompt: Optional[str], prompt: str, params: Optional[Dict]):
+    # params are the other request fields that change the output (e.g. options)
+    signature = (model, system_prompt or "", json.dumps(params or {}, sort_keys=True))
+    return _sha256(*signature), _sha256(*signature, normalize_prompt(prompt))
+
+
+class ResponseCache:
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = 24 * 3600,
+                 max_entries: int = 1000, threshold: float = 0.92, scan_limit: int = 200,
+                 max_fuzzy_chars: int = 500, max_pending: int = 64):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.scan_limit = scan_limit
+        # Longer prompts (files, pasted code) only ever match exactly: a
+        # one-line edit barely moves their embedding
+        self.max_fuzzy_chars = max_fuzzy_chars
+        # Embeddings computed by get(), waiting for the matching put(). A failed
+        # request never calls put(), so only the newest max_pending are kept
+        self._pending = {}
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        try:
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    scope TEXT NOT NULL,
+                    prompt TEXT NOT NULL,
+                    embedding BLOB,
+                    response TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    ts REAL NOT NULL
+                )"""
+            )
+            self.db.execute("CREATE INDEX IF NOT EXISTS responses_scope_ts ON responses (scope, ts)")
+            self.db.commit()
+        except sqlite3.Error:
+            # Caching is best effort; a read-only home directory just disables it
+            self.db = None
+
+    def get(self, model: str, system_prompt: Optional[str], prompt: str,
+            embed: Optional[Callable[[str], Optional[List[float]]]] = None,
+            params: Optional[Dict] = None) -> Optional[str]:
+        """Return a cached response, or None on a miss
+
+        On an exact-match miss of a prompt up to max_fuzzy_chars long, `embed`
+        is called to compute the prompt embedding for the similarity lookup.
+        The embedding is remembered so a following put() for the same prompt
+        does not compute it again.
+        """
+        if self.db is None:
+            return None
+
+        now = time.time()
+        scope, key = _scope_and_key(model, system_prompt, prompt, params)
+        try:
+            with self._lock:
+                # Expired rows are deleted by put(); lookups just skip them
+                row = self.db.execute(
+                    "SELECT response FROM responses WHERE key = ? AND created >= ?",
+                    (key, now - self.ttl)
+                ).fetchone()
+                if row:
+                    self._touch(key, now)
+                    return row[0]
+
+            if embed is None or len(prompt) > self.max_fuzzy_chars:
+                return None
+            embedding = embed(prompt)
+            if not embedding:
+                return None
+
+            with self._lock:
+                self._pending.pop(key, None)
+                self._pending[key] = embedding
+                while len(self._pending) > self.max_pending:
+                    del self._pending[next(iter(self._pending))]
+                rows = self.db.execute(
+                    "SELECT key, embedding, response FROM responses "
+                    "WHERE scope = ? AND created >= ? AND embedding IS NOT NULL ORDER BY ts DESC LIMIT ?",
+                    (scope, now - self.ttl, self.scan_limit)
+                ).fetchall()
+                best_key, best_response, best_sim = None, None, self.threshold
+                for row_key, blob, response in rows:
+                    sim = self._cosine(embedding, array("f", blob))
+                    if sim > best_sim:
+                        best_key, best_response, best_sim = row_key, response, sim
+                if best_key:
+                    self._touch(best_key, now)
+                return best_response
+        except sqlite3.Error:
+            return None
+
+    def put(self, model: str, system_prompt: Optional[str], prompt: str, response: str,
+            params: Optional[Dict] = None):
+        """Store a response and evict expired and least recently used entries"""
+        if self.db is None:
+            return
+
+        now = time.time()
+        scope, key = _scope_and_key(model, system_prompt, prompt, params)
+        try:
+            with self._lock:
+                embedding = self._pending.pop(key, None)
+                blob = array("f", embedding).tobytes() if embedding else None
+                self.db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, scope, prompt, blob, response, now, now)
+                )
+                self.db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+                self.db.execute(
+                    "DELETE FROM responses WHERE key NOT IN "
+                    "(SELECT key FROM responses ORDER BY ts DESC LIMIT ?)",
+                    (self.max_entries,)
+                )
+                self.db.commit()
+        except sqlite3.Error:
+            pass
+
+    def _touch(self, key: str, now: float):
+        self.db.execute("UPDATE responses SET ts = ? WHERE key = ?", (now, key))
+        self.db.commit()
+
+    @staticmethod
+    def _cosine(a, b) -> float:
+        if len(a) != len(b):
+            return 0.0
+        np = _load_numpy()
+        if np is not None:
+            va = np.asarray(a, dtype=np.float32)
+            vb = np.frombuffer(b, dtype=np.float32)
+            denom = float(np.linalg.norm(va) * np.linalg.norm(vb))
+            return float(np.dot(va, vb)) / denom if denom else 0.0
+        dot = sum(x * y for x, y in zip(a, b))
+        denom = (sum(x * x for x in a) ** 0.5) * (sum(y * y for y in b) ** 0.5)
+        return dot / denom if denom else 0.0
@@ -0,0 +1,111 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import response_cache
+from response_cache import ResponseCache
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache.db")
+        self.cache = ResponseCache(path=self.path)
+
+    def tearDown(self):
+        self.cache.db.close()
+        self.tmp.cleanup()
+
+    def test_put_then_get(self):
+        self.assertIsNone(self.cache.get("m", "sys", "Hello"))
+        self.cache.put("m", "sys", "Hello", "Hi there")
+        self.assertEqual(self.cache.get("m", "sys", "Hello"), "Hi there")
+        self.assertEqual(self.cache.get("m", "sys", "  Hello\n"), "Hi there")
+
+    def test_key_includes_model_and_system_prompt(self):
+        self.cache.put("m", "sys", "Hello", "Hi there")
+        self.assertIsNone(self.cache.get("other", "sys", "Hello"))
+        self.assertIsNone(self.cache.get("m", "other", "Hello"))
+        self.assertIsNone(self.cache.get("m", None, "Hello"))
+
+    def test_key_includes_params(self):
+        self.cache.put("m", "sys", "Hello", "Hi", params={"options": {"num_predict": 16}})
+        self.assertIsNone(self.cache.get("m", "sys", "Hello"))
+        self.assertIsNone(self.cache.get("m", "sys", "Hello", params={"options": {"num_predict": 512}}))
+        self.assertEqual(self.cache.get("m", "sys", "Hello", params={"options": {"num_predict": 16}}), "Hi")
+
+    def test_similarity_is_scoped_by_params(self):
+        embed = lambda text: [1.0, 0.0]
+        self.cache.get("m", None, "Hello", embed=embed, params={"options": {"num_predict": 16}})
+        self.cache.put("m", None, "Hello", "Hi", params={"options": {"num_predict": 16}})
+        self.assertIsNone(self.cache.get("m", None, "Hello!", embed=embed, params={"options": {}}))
+
+    def test_code_prompts_do_not_collide(self):
+        self.cache.put("m", "sys", "if x == 1: return a+b", "review 1")
+        self.assertIsNone(self.cache.get("m", "sys", "if x != 1: return a-b"))
+        self.assertIsNone(self.cache.get("m", "sys", "IF X == 1: RETURN A+B"))
+        self.cache.put("m", "sys", "if x:\n    a()\nb()", "review 2")
+        self.assertIsNone(self.cache.get("m", "sys", "if x:\n    a()\n    b()"))
+
+    def test_entries_expire_after_ttl(self):
+        with mock.patch.object(response_cache.time, "time", return_value=1000.0):
+            self.cache.put("m", None, "Hello", "Hi there")
+        with mock.patch.object(response_cache.time, "time", return_value=1000.0 + self.cache.ttl - 1):
+            self.assertEqual(self.cache.get("m", None, "Hello"), "Hi there")
+        with mock.patch.object(response_cache.time, "time", return_value=1000.0 + self.cache.ttl + 1):
+            self.assertIsNone(self.cache.get("m", None, "Hello"))
+
+    def test_put_deletes_expired_entries(self):
+        with mock.patch.object(response_cache.time, "time", return_value=1000.0):
+            self.cache.put("m", None, "Hello", "Hi there")
+        with mock.patch.object(response_cache.time, "time", return_value=1000.0 + self.cache.ttl + 1):
+            self.cache.put("m", None, "Bye", "See you")
+        self.assertEqual(self.cache.db.execute("SELECT COUNT(*) FROM responses").fetchone()[0], 1)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.cache.max_entries = 2
+        with mock.patch.object(response_cache.time, "time", return_value=1.0):
+            self.cache.put("m", None, "a", "A")
+        with mock.patch.object(response_cache.time, "time", return_value=2.0):
+            self.cache.put("m", None, "b", "B")
+        with mock.patch.object(response_cache.time, "time", return_value=3.0):
+            self.assertEqual(self.cache.get("m", None, "a"), "A")
+        with mock.patch.object(response_cache.time, "time", return_value=4.0):
+            self.cache.put("m", None, "c", "C")
+            self.assertEqual(self.cache.get("m", None, "a"), "A")
+            self.assertIsNone(self.cache.get("m", None, "b"))
+            self.assertEqual(self.cache.get("m", None, "c"), "C")
+
+    def test_similar_short_prompt_matches_embedding(self):
+        embeddings = {"What is recursion?": [1.0, 0.0], "what is recursion": [0.99, 0.05], "Bake a cake": [0.0, 1.0]}
+        embed = embeddings.get
+        self.assertIsNone(self.cache.get("m", None, "What is recursion?", embed=embed))
+        self.cache.put("m", None, "What is recursion?", "A function calling itself")
+        self.assertEqual(self.cache.get("m", None, "what is recursion", embed=embed), "A function calling itself")
+        self.assertIsNone(self.cache.get("m", None, "Bake a cake", embed=embed))
+
+    def test_pending_embeddings_are_capped(self):
+        self.cache.max_pending = 2
+        embed = lambda text: [1.0, 0.0]
+        for prompt in ("a", "b", "c"):
+            self.cache.get("m", None, prompt, embed=embed)
+        self.assertEqual(len(self.cache._pending), 2)
+
+    def test_long_prompts_skip_embedding(self):
+        embed = mock.Mock(return_value=[1.0, 0.0])
+        self.assertIsNone(self.cache.get("m", None, "x" * (self.cache.max_fuzzy_chars + 1), embed=embed))
+        embed.assert_not_called()
+
+    def test_unwritable_path_disables_cache(self):
+        cache = ResponseCache(path=os.path.join(self.tmp.name, "missing", "cache.db"))
+        self.assertIsNone(cache.db)
+        cache.put("m", None, "Hello", "Hi there")
+        self.assertIsNone(cache.get("m", None, "Hello"))
+
+
+if __name__ == "__main__":
+    unittest.main()